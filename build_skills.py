@@ -0,0 +1,294 @@
+"""
+Script to build the skill of every tenant from the sample-skill
+
+For each tenant, the permissions of the sample-skill manifest are loaded into
+the tenant's skill.json, and the interaction models are copied from the
+sample-skill. If the tenant has a course catalog export, the values of the
+`COURSE_NAME` slot type are generated from it. With `--sync-lambda`, the
+lambda code is copied from the sample-skill too, overwriting the tenant's code.
+
+The tenants are built in parallel and only the files whose content changed
+are rewritten.
+
+Usage:
+    python build_skills.py <tenants.json> [--sync-lambda]
+
+The tenants file is a JSON list like:
+
+    [
+        {
+            "folder": "tenant-skill",
+            "catalog": "catalogs/tenant.json",
+            "invocationNames": {"en-US": "tenant assistant"}
+        }
+    ]
+
+where only `folder` is required. The catalog is a JSON list of courses with the
+`id` and the `name` of each course. The response of the LMS
+`/api/courses/v1/courses/` endpoint is paginated, so the results of every page
+must be exported to the catalog.
+"""
+from __future__ import annotations
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+SKILL_FOLDER = "skills"
+SAMPLE_SKILL_FOLDER = "sample-skill"
+SAMPLE_SKILL_PATH = f"{SAMPLE_SKILL_FOLDER}/skill-package/skill.json"
+SAMPLE_INTERACTION_MODELS_PATH = f"{SAMPLE_SKILL_FOLDER}/skill-package/interactionModels/custom"
+SAMPLE_LAMBDA_PATH = f"{SAMPLE_SKILL_FOLDER}/lambda"
+COURSE_NAME_SLOT_TYPE = "COURSE_NAME"
+IGNORED_LAMBDA_NAMES = {"__pycache__", ".env"}
+
+
+def dump_json(content: dict) -> bytes:
+    """Serialize the content with the same format as the skill packages."""
+    return json.dumps(content, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def write_if_changed(path: str, content: bytes) -> bool:
+    """
+    Write the content to the file only if its hash is different from the
+    hash of the current content of the file.
+
+    Args:
+        path (str): The path of the file.
+        content (bytes): The new content of the file.
+
+    Returns:
+        bool: True if the file was written, False otherwise.
+    """
+    if os.path.exists(path):
+        with open(path, "rb") as current_file:
+            current_hash = hashlib.sha256(current_file.read()).digest()
+        if current_hash == hashlib.sha256(content).digest():
+            return False
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as new_file:
+        new_file.write(content)
+
+    return True
+
+
+def update_manifest(skill_folder: str, permissions: list) -> bool:
+    """
+    Load the permissions of the sample-skill into the manifest of the skill.
+
+    Args:
+        skill_folder (str): The folder of the skill inside `skills/`.
+        permissions (list): The permissions of the sample-skill manifest.
+
+    Returns:
+        bool: True if the manifest was written, False otherwise.
+    """
+    manifest_path = f"{SKILL_FOLDER}/{skill_folder}/skill-package/skill.json"
+    with open(manifest_path, "r", encoding="utf-8") as manifest_file:
+        manifest = json.load(manifest_file)
+
+    manifest["manifest"]["permissions"] = permissions
+
+    return write_if_changed(manifest_path, dump_json(manifest))
+
+
+def load_sample_permissions() -> list:
+    """Return the permissions of the sample-skill manifest."""
+    with open(SAMPLE_SKILL_PATH, "r", encoding="utf-8") as sample_manifest:
+        return json.load(sample_manifest)["manifest"]["permissions"]
+
+
+def load_sample_interaction_models() -> dict[str, dict]:
+    """Return the interaction models of the sample-skill, by file name."""
+    interaction_models = {}
+
+    for path in sorted(glob.glob(f"{SAMPLE_INTERACTION_MODELS_PATH}/*.json")):
+        with open(path, "r", encoding="utf-8") as interaction_model:
+            interaction_models[os.path.basename(path)] = json.load(interaction_model)
+
+    return interaction_models
+
+
+def load_sample_lambda() -> dict[str, bytes]:
+    """Return the files of the sample-skill lambda, by path relative to it."""
+    lambda_files = {}
+
+    for root, folders, files in os.walk(SAMPLE_LAMBDA_PATH):
+        folders[:] = [folder for folder in folders if folder not in IGNORED_LAMBDA_NAMES]
+        for name in files:
+            if name in IGNORED_LAMBDA_NAMES or name.endswith(".pyc"):
+                continue
+            path = os.path.join(root, name)
+            with open(path, "rb") as lambda_file:
+                lambda_files[os.path.relpath(path, SAMPLE_LAMBDA_PATH)] = lambda_file.read()
+
+    return lambda_files
+
+
+def get_course_name_values(catalog_path: str) -> list[dict]:
+    """
+    Generate the values of the `COURSE_NAME` slot type from a course catalog.
+
+    The value of each slot is the course name, with the course ID as the slot ID
+    and its "org course run" form as a synonym, like the forms compared by the
+    skill's fuzzy matcher.
+
+    Args:
+        catalog_path (str): The path of the course catalog export.
+
+    Returns:
+        list[dict]: The slot values, one for each course name.
+    """
+    with open(catalog_path, "r", encoding="utf-8") as catalog_file:
+        catalog = json.load(catalog_file)
+
+    if isinstance(catalog, dict):
+        if (catalog.get("pagination") or {}).get("next"):
+            print(
+                f"Warning: {catalog_path} only contains the first page of the "
+                "courses, the courses of the other pages are missing.",
+                file=sys.stderr,
+            )
+        catalog = catalog.get("results", [])
+
+    values = {}
+    for course in catalog:
+        name = (course.get("name") or "").strip()
+        course_id = course.get("id")
+        if not name or not course_id or name.lower() in values:
+            continue
+
+        org_course_run = course_id.replace("course-v1:", "").replace("+", " ").lower()
+        values[name.lower()] = {
+            "id": course_id,
+            "name": {"value": name, "synonyms": [org_course_run]},
+        }
+
+    return list(values.values())
+
+
+def build_interaction_model(
+    interaction_model: dict,
+    locale: str,
+    tenant: dict,
+    course_name_values: list[dict] | None,
+) -> dict:
+    """
+    Return the interaction model of the sample-skill adapted to the tenant.
+
+    Args:
+        interaction_model (dict): The interaction model of the sample-skill.
+        locale (str): The locale of the interaction model, e.g. "en-US".
+        tenant (dict): The tenant configuration.
+        course_name_values (list[dict] | None): The values of the
+        `COURSE_NAME` slot type, or None to keep the sample values.
+
+    Returns:
+        dict: The interaction model of the tenant.
+    """
+    interaction_model = json.loads(json.dumps(interaction_model))
+    language_model = interaction_model["interactionModel"]["languageModel"]
+
+    invocation_name = tenant.get("invocationNames", {}).get(locale)
+    if invocation_name:
+        language_model["invocationName"] = invocation_name
+
+    if course_name_values:
+        for slot_type in language_model.get("types", []):
+            if slot_type["name"] == COURSE_NAME_SLOT_TYPE:
+                slot_type["values"] = course_name_values
+
+    return interaction_model
+
+
+def build_skill(
+    tenant: dict,
+    permissions: list,
+    interaction_models: dict[str, dict],
+    lambda_files: dict[str, bytes] | None = None,
+) -> tuple[str, list[str]]:
+    """
+    Build the skill of a tenant.
+
+    Args:
+        tenant (dict): The tenant configuration.
+        permissions (list): The permissions of the sample-skill manifest.
+        interaction_models (dict[str, dict]): The interaction models of the
+        sample-skill, by file name.
+        lambda_files (dict[str, bytes] | None): The files of the sample-skill
+        lambda, to overwrite the tenant's lambda with, or None to keep it.
+
+    Returns:
+        tuple[str, list[str]]: The folder of the skill and the written files.
+    """
+    skill_path = f"{SKILL_FOLDER}/{tenant['folder']}"
+    written = []
+
+    if update_manifest(tenant["folder"], permissions):
+        written.append(f"{skill_path}/skill-package/skill.json")
+
+    course_name_values = None
+    if tenant.get("catalog"):
+        course_name_values = get_course_name_values(tenant["catalog"])
+
+    for file_name, interaction_model in interaction_models.items():
+        locale = os.path.splitext(file_name)[0]
+        path = f"{skill_path}/skill-package/interactionModels/custom/{file_name}"
+        content = build_interaction_model(interaction_model, locale, tenant, course_name_values)
+        if write_if_changed(path, dump_json(content)):
+            written.append(path)
+
+    for relative_path, content in (lambda_files or {}).items():
+        path = os.path.join(skill_path, "lambda", relative_path)
+        if write_if_changed(path, content):
+            written.append(path)
+
+    return skill_path, written
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("tenants", help="JSON file with the tenants configuration")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument(
+        "--sync-lambda",
+        action="store_true",
+        help="overwrite the lambda code of every tenant with the sample-skill code",
+    )
+    args = parser.parse_args()
+
+    with open(args.tenants, "r", encoding="utf-8") as tenants_file:
+        tenants = json.load(tenants_file)
+
+    permissions = load_sample_permissions()
+    interaction_models = load_sample_interaction_models()
+    lambda_files = load_sample_lambda() if args.sync_lambda else None
+    failed = 0
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [
+            executor.submit(build_skill, tenant, permissions, interaction_models, lambda_files)
+            for tenant in tenants
+        ]
+        for tenant, future in zip(tenants, futures):
+            try:
+                skill_path, written = future.result()
+            except Exception as error:  # pylint: disable=broad-except
+                failed += 1
+                print(f"{SKILL_FOLDER}/{tenant.get('folder')}: failed: {error}")
+                continue
+
+            print(f"{skill_path}: {len(written)} file(s) updated")
+            for path in written:
+                print(f"  {path}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+"""
+Script to replay the requests recorded by the skill's recorder
+against the lambda_handler of a skill
+
+Every request is replayed in a pool of processes at the given rate, with the
+email and the LMS responses served from the recording. Then, the latency
+distribution and the differences between the recorded and the replayed
+responses are reported.
+
+Usage:
+    python replay.py <recording.jsonl> [--rps 10] [--workers 4] [--repeat 1]
+"""
+from __future__ import annotations
+
+import argparse
+import difflib
+import importlib
+import json
+import math
+import os
+import sys
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from multiprocessing import Manager
+from urllib.parse import urlsplit
+
+SAMPLE_SKILL_LAMBDA_PATH = "sample-skill/lambda"
+REPLAY_LMS_DOMAIN = "https://lms.replay.invalid"
+WARM_UP_TIMEOUT = 60
+TOKEN_PATH = "/oauth2/access_token"
+TOKEN_RESPONSE = {"access_token": "replay-token", "expires_in": 3600}
+
+_skill = None
+_replayed_email = None
+
+
+class ReplayResponse:
+    """Response of the LMS served from the recording."""
+
+    def __init__(self, payload: dict | None):
+        self.payload = payload
+        self.status_code = HTTPStatus.OK if payload is not None else HTTPStatus.NOT_FOUND
+
+    def json(self) -> dict | None:
+        return self.payload
+
+
+class ReplaySession:
+    """
+    Replacement of the skill's requests session that serves the LMS responses
+    of the record being replayed.
+
+    Responses are served in the recorded order for each method and path. Token
+    requests are never recorded, so they are always answered with a fake token.
+    """
+
+    def __init__(self):
+        self.responses: dict[tuple[str, str], deque] = defaultdict(deque)
+
+    def load(self, exchanges: list[dict]) -> None:
+        self.responses.clear()
+        for exchange in exchanges:
+            self.responses[(exchange["method"], exchange["path"])].append(exchange["response"])
+
+    def request(self, method: str, url: str) -> ReplayResponse:
+        path = urlsplit(url).path
+
+        if path == TOKEN_PATH:
+            return ReplayResponse(TOKEN_RESPONSE)
+
+        responses = self.responses[(method, path)]
+
+        return ReplayResponse(responses.popleft() if responses else None)
+
+    def get(self, url: str, **kwargs) -> ReplayResponse:  # pylint: disable=unused-argument
+        return self.request("GET", url)
+
+    def post(self, url: str, **kwargs) -> ReplayResponse:  # pylint: disable=unused-argument
+        return self.request("POST", url)
+
+    def head(self, url: str, **kwargs) -> ReplayResponse:  # pylint: disable=unused-argument
+        return ReplayResponse({})
+
+
+def init_worker(lambda_path: str) -> None:
+    """
+    Load the skill in the worker process, isolated from the real LMS.
+
+    The recorded envelopes do not contain access tokens, so the configured
+    email authentication backend is replaced by one that returns the email
+    of the record being replayed.
+    """
+    global _skill  # pylint: disable=global-statement
+
+    # Set (not removed) so the values of the skill's .env file are not loaded.
+    os.environ["LMS_DOMAIN"] = REPLAY_LMS_DOMAIN
+    os.environ["SKILL_RECORDER_FILE"] = ""
+
+    os.chdir(lambda_path)
+    sys.path.insert(0, lambda_path)
+
+    _skill = importlib.import_module("lambda_function")
+    utils = importlib.import_module("alexa.utils")
+    utils.session = ReplaySession()
+
+    email_auth_class = utils.get_email_auth_class()
+
+    class ReplayEmailAuthentication(email_auth_class):
+        """Email authentication backend that returns the recorded email."""
+
+        def __init__(self, handler_input):  # pylint: disable=super-init-not-called
+            self.handler_input = handler_input
+
+        def get_email(self) -> str | None:
+            return _replayed_email
+
+    _skill.get_email_auth_class = lambda: ReplayEmailAuthentication
+
+
+def warm_worker(barrier) -> None:
+    """
+    Wait until every worker is running a warm-up task, so every worker has
+    loaded the skill before the replay starts.
+    """
+    barrier.wait(WARM_UP_TIMEOUT)
+
+
+def replay_record(record: dict) -> tuple[float, dict | None, str | None]:
+    """
+    Replay a record against the skill's lambda_handler.
+
+    If the recorded request used a cached token, a token is cached before the
+    replay, so a rejected token is retried as it was when recording.
+
+    Returns:
+        tuple[float, dict | None, str | None]: The latency in milliseconds,
+        the replayed response and the error raised, if any.
+    """
+    global _replayed_email  # pylint: disable=global-statement
+
+    utils = importlib.import_module("alexa.utils")
+    utils.session.load(record["lms"])
+    _replayed_email = record.get("email")
+    _skill.invalidate_bearer_token()
+    if record.get("token_cached"):
+        _skill.get_bearer_token(force_refresh=True)
+
+    start = time.perf_counter()
+    try:
+        output = _skill.lambda_handler(record["envelope"], None)
+    except Exception as error:  # pylint: disable=broad-except
+        return (time.perf_counter() - start) * 1000, None, repr(error)
+
+    return (time.perf_counter() - start) * 1000, output.get("response"), None
+
+
+def percentile(values: list[float], rank: float) -> float:
+    """Return the nearest-rank percentile of the sorted values."""
+    index = max(math.ceil(rank / 100 * len(values)) - 1, 0)
+    return values[index]
+
+
+def diff_responses(recorded: dict | None, replayed: dict | None) -> list[str]:
+    """Return the unified diff between the recorded and the replayed response."""
+    return list(
+        difflib.unified_diff(
+            json.dumps(recorded, indent=2, sort_keys=True).splitlines(),
+            json.dumps(replayed, indent=2, sort_keys=True).splitlines(),
+            fromfile="recorded",
+            tofile="replayed",
+            lineterm="",
+        )
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("recording", help="JSONL file written by the skill's recorder")
+    parser.add_argument("--lambda-path", default=SAMPLE_SKILL_LAMBDA_PATH)
+    parser.add_argument("--rps", type=float, default=10, help="requests per second")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--repeat", type=int, default=1, help="times to replay the recording")
+    parser.add_argument("--max-diffs", type=int, default=5, help="diffs to print")
+    args = parser.parse_args()
+
+    with open(args.recording, "r", encoding="utf-8") as recording:
+        records = [json.loads(line) for line in recording if line.strip()] * args.repeat
+
+    if not records:
+        print("The recording is empty.")
+        return 1
+
+    with Manager() as manager, ProcessPoolExecutor(
+        max_workers=args.workers,
+        initializer=init_worker,
+        initargs=(os.path.abspath(args.lambda_path),),
+    ) as executor:
+        barrier = manager.Barrier(args.workers)
+        for future in [executor.submit(warm_worker, barrier) for _ in range(args.workers)]:
+            future.result()
+
+        futures = []
+        submit_times = []
+        start = time.monotonic()
+        for index, record in enumerate(records):
+            delay = start + index / args.rps - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            submit_times.append(time.monotonic())
+            futures.append(executor.submit(replay_record, record))
+        results = [future.result() for future in futures]
+
+    submit_duration = submit_times[-1] - submit_times[0]
+    rate = (len(records) - 1) / submit_duration if submit_duration else float("inf")
+
+    latencies = sorted(latency for latency, _, _ in results)
+    errors = [error for _, _, error in results if error]
+    diffs = [
+        diff
+        for record, (_, response, error) in zip(records, results)
+        if not error and (diff := diff_responses(record.get("response"), response))
+    ]
+
+    print(f"Requests: {len(records)} submitted in {submit_duration:.2f}s ({rate:.2f} rps)")
+    print(
+        "Latency (ms): "
+        f"mean={sum(latencies) / len(latencies):.2f} "
+        f"p50={percentile(latencies, 50):.2f} "
+        f"p90={percentile(latencies, 90):.2f} "
+        f"p99={percentile(latencies, 99):.2f} "
+        f"max={latencies[-1]:.2f}"
+    )
+    print(f"Errors: {len(errors)}")
+    print(f"Responses different from the recording: {len(diffs)}")
+
+    for error in errors[: args.max_diffs]:
+        print(f"\n{error}")
+    for diff in diffs[: args.max_diffs]:
+        print("\n" + "\n".join(diff))
+
+    return 1 if errors or diffs else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
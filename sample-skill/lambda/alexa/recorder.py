@@ -0,0 +1,275 @@
+"""
+Traffic recorder for the Alexa skill.
+
+When enabled, the recorder interceptors write every handled request to a JSONL
+file: the request envelope, the email returned by the authentication backend,
+whether the LMS token was already cached, the LMS responses obtained while handling it and the response returned by the
+skill. The recordings are used by `replay.py` to replay realistic traffic
+against the `lambda_handler`.
+
+Only the fields of the LMS responses read by the skill are recorded.
+Identifiers (users, devices, persons, sessions), emails and usernames are
+replaced by pseudonyms, and access tokens are dropped before writing. The
+pseudonyms are only stable within the container that produced them.
+
+Recording never changes the response of the skill: any error while recording
+is logged and the record is discarded.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+import secrets
+import threading
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+from ask_sdk_core.dispatch_components import (
+    AbstractRequestInterceptor,
+    AbstractResponseInterceptor,
+)
+from ask_sdk_core.handler_input import HandlerInput
+from ask_sdk_core.serialize import DefaultSerializer
+from ask_sdk_model.response import Response
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+TOKEN_PATH = "/oauth2/access_token"
+DROPPED_KEYS = {"apiAccessToken", "accessToken", "consentToken"}
+PSEUDONYMIZED_KEYS = {"userId", "deviceId", "personId", "sessionId", "email", "username"}
+
+# Fields of the LMS responses read by the skill, by endpoint path. A nested
+# dict keeps those fields of each element of a list.
+RECORDED_FIELDS = {
+    "/eox-core/api/v1/user/": {"username": None},
+    "/eox-core/api/v1/grade/": {"earned_grade": None},
+    "/api/enrollment/v1/enrollments/": {"results": {"course_id": None}},
+    "/api/courses/v1/courses/": {"results": {"id": None, "name": None}},
+}
+
+_SALT = secrets.token_hex(16)
+_state = threading.local()
+_serializer = DefaultSerializer()
+
+
+def pseudonymize(value: str) -> str:
+    """
+    Return a pseudonym for the given value.
+
+    Args:
+        value (str): The value to hide.
+
+    Returns:
+        str: A pseudonym that is always the same for the same value.
+    """
+    digest = hashlib.sha256(f"{_SALT}{value}".encode("utf-8")).hexdigest()
+    return f"anon-{digest[:16]}"
+
+
+class Anonymizer:
+    """
+    Collect the sensitive values of a record and hide them.
+
+    Sensitive values are collected from the known keys of the envelope and the
+    LMS exchanges, and then hidden in every string of the record, so the values
+    repeated in the skill's response (e.g. the username) are hidden as well.
+    Only whole strings or whole words are replaced, never parts of them.
+    """
+
+    def __init__(self):
+        self.pseudonyms: dict[str, str] = {}
+
+    def collect(self, value: Any) -> None:
+        """Collect the sensitive values found in the given value."""
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if key in PSEUDONYMIZED_KEYS and isinstance(item, str) and item:
+                    self.pseudonyms[item] = pseudonymize(item)
+                else:
+                    self.collect(item)
+        elif isinstance(value, list):
+            for item in value:
+                self.collect(item)
+
+    def anonymize(self, value: Any) -> Any:
+        """Return a copy of the value without tokens and with the sensitive values hidden."""
+        pattern = None
+        if self.pseudonyms:
+            alternatives = sorted(self.pseudonyms, key=len, reverse=True)
+            pattern = re.compile(
+                r"(?<!\w)(?:" + "|".join(map(re.escape, alternatives)) + r")(?!\w)"
+            )
+
+        return self._anonymize(_drop_keys(value), pattern)
+
+    def _anonymize(self, value: Any, pattern: Optional[re.Pattern]) -> Any:
+        if isinstance(value, dict):
+            return {key: self._anonymize(item, pattern) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._anonymize(item, pattern) for item in value]
+        if not isinstance(value, str) or pattern is None:
+            return value
+        if value in self.pseudonyms:
+            return self.pseudonyms[value]
+        return pattern.sub(lambda match: self.pseudonyms[match.group(0)], value)
+
+
+def _drop_keys(value: Any) -> Any:
+    """Return a copy of the value without the keys holding access tokens."""
+    if isinstance(value, dict):
+        return {
+            key: _drop_keys(item) for key, item in value.items() if key not in DROPPED_KEYS
+        }
+    if isinstance(value, list):
+        return [_drop_keys(item) for item in value]
+    return value
+
+
+def _keep_fields(value: Any, fields: Optional[dict]) -> Any:
+    """Return a copy of the value with only the given fields."""
+    if fields is None:
+        return value
+    if isinstance(value, list):
+        return [_keep_fields(item, fields) for item in value]
+    if isinstance(value, dict):
+        return {
+            key: _keep_fields(value[key], nested)
+            for key, nested in fields.items()
+            if key in value
+        }
+    return value
+
+
+def record_email(email: Optional[str]) -> None:
+    """
+    Add the email returned by the authentication backend to the record of
+    the request being handled.
+
+    Nothing is recorded if the recorder is not enabled.
+
+    Args:
+        email (str, optional): The email of the user, or None if it can't be obtained.
+    """
+    record = getattr(_state, "record", None)
+
+    if record is not None:
+        record["email"] = email
+
+
+def record_token_cached(cached: bool) -> None:
+    """
+    Add to the record of the request being handled whether the first Bearer
+    token it used was served from the cache.
+
+    A cached token rejected by the LMS is retried with a new one, so the replay
+    needs this state to serve the recorded LMS responses in the same order.
+    Nothing is recorded if the recorder is not enabled.
+
+    Args:
+        cached (bool): Whether the token was served from the cache.
+    """
+    record = getattr(_state, "record", None)
+
+    if record is not None:
+        record.setdefault("token_cached", cached)
+
+
+def record_lms_exchange(
+    method: str, url: str, params: Optional[dict | str], response: dict
+) -> None:
+    """
+    Add an LMS exchange to the record of the request being handled.
+
+    Nothing is recorded if the recorder is not enabled. Token requests are
+    never recorded, since they contain the client credentials, and only the
+    fields read by the skill are kept from the known endpoints.
+
+    Args:
+        method (str): The HTTP method used.
+        url (str): The requested URL.
+        params (dict | str, optional): The query parameters or payload sent.
+        response (dict): The response returned by `make_request`.
+    """
+    record = getattr(_state, "record", None)
+
+    if record is None:
+        return
+
+    try:
+        path = urlsplit(url).path
+        if path == TOKEN_PATH:
+            return
+
+        fields = next(
+            (fields for suffix, fields in RECORDED_FIELDS.items() if path.endswith(suffix)),
+            None,
+        )
+        record["lms"].append(
+            {
+                "method": method,
+                "path": path,
+                "params": params,
+                "response": _keep_fields(response, fields),
+            }
+        )
+    except Exception as error:  # pylint: disable=broad-except
+        logger.error("Unable to record the LMS exchange: %s", error)
+        _state.record = None
+
+
+class RecorderRequestInterceptor(AbstractRequestInterceptor):
+    """
+    Interceptor that starts the record of the request being handled.
+
+    This interceptor stores the request envelope, so the LMS exchanges and the
+    response of the skill can be added to the same record.
+    """
+
+    def process(self, handler_input: HandlerInput) -> None:
+        try:
+            _state.record = {
+                "envelope": _serializer.serialize(handler_input.request_envelope),
+                "email": None,
+                "lms": [],
+            }
+        except Exception as error:  # pylint: disable=broad-except
+            logger.error("Unable to start the record: %s", error)
+            _state.record = None
+
+
+class RecorderResponseInterceptor(AbstractResponseInterceptor):
+    """
+    Interceptor that writes the record of the handled request.
+
+    Requests that end in an exception handler do not go through response
+    interceptors, so they are not recorded.
+
+    Attributes:
+        path (str): The JSONL file where the records are appended.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def process(self, handler_input: HandlerInput, response: Optional[Response]) -> None:
+        record = getattr(_state, "record", None)
+        _state.record = None
+
+        if record is None:
+            return
+
+        try:
+            record["response"] = _serializer.serialize(response)
+
+            anonymizer = Anonymizer()
+            anonymizer.collect(record)
+            line = json.dumps(anonymizer.anonymize(record))
+
+            with open(self.path, "a", encoding="utf-8") as recording:
+                recording.write(line + "\n")
+        except Exception as error:  # pylint: disable=broad-except
+            logger.error("Unable to write the record: %s", error)
@@ -11,3 +11,4 @@ EOX_CORE_CLIENT_SECRET = os.getenv("EOX_CORE_CLIENT_SECRET")
 EOX_CORE_GRANT_TYPE = os.getenv("EOX_CORE_GRANT_TYPE")
 REQUEST_MAX_TIMEOUT = int(os.getenv("REQUEST_MAX_TIMEOUT", "5"))
 SKILL_PROFILE_EMAIL_BACKEND = os.getenv("SKILL_PROFILE_EMAIL_BACKEND")
+SKILL_RECORDER_FILE = os.getenv("SKILL_RECORDER_FILE")
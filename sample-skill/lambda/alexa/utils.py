@@ -1,6 +1,7 @@
 """Utility functions for the Alexa skill."""
 from __future__ import annotations
 
+import gettext
 import os
 import sys
 from http import HTTPStatus
@@ -10,12 +11,19 @@ from typing import Callable, Optional
 import requests
 from auth.backends.alexa_ups import AlexaEmailAuthentication
 
-from alexa.settings import REQUEST_MAX_TIMEOUT, SKILL_PROFILE_EMAIL_BACKEND
+from alexa.recorder import record_lms_exchange
+from alexa.settings import LMS_DOMAIN, REQUEST_MAX_TIMEOUT, SKILL_PROFILE_EMAIL_BACKEND
 
 
 project_root = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(os.path.join(project_root, "../.."))
 
+LOCALE_DIR = "locale"
+
+# Shared across invocations of a warm container so TLS connections to the LMS
+# are pooled instead of being negotiated on every request.
+session = requests.Session()
+
 
 def make_request(
     url: str,
@@ -39,18 +47,18 @@ def make_request(
         if the request is successful, empty dict otherwise.
     """
     if method == "GET":
-        response = requests.get(
+        response = session.get(
             url, data=data, params=params, headers=headers, timeout=REQUEST_MAX_TIMEOUT
         )
     elif method == "POST":
-        response = requests.post(url, data=data, headers=headers, timeout=REQUEST_MAX_TIMEOUT)
+        response = session.post(url, data=data, headers=headers, timeout=REQUEST_MAX_TIMEOUT)
     else:
         return {}
 
-    if response.status_code == HTTPStatus.OK:
-        return response.json()
+    result = response.json() if response.status_code == HTTPStatus.OK else {}
+    record_lms_exchange(method, url, params or data, result)
 
-    return {}
+    return result
 
 
 def get_email_auth_class() -> Callable:
@@ -72,3 +80,56 @@ def get_email_auth_class() -> Callable:
     module = import_module(module_name)
 
     return getattr(module, class_name, AlexaEmailAuthentication)
+
+
+def get_translation(locale: str) -> gettext.NullTranslations:
+    """
+    Get the translation catalog for the given locale.
+
+    `gettext` caches the parsed `.mo` files, so only the first call for a
+    locale reads from disk.
+
+    Args:
+        locale (str): The locale of the request, e.g. "en-US".
+
+    Returns:
+        gettext.NullTranslations: The translation catalog for the locale, or
+        a fallback catalog if the locale is not available.
+    """
+    return gettext.translation(
+        "data",
+        localedir=LOCALE_DIR,
+        languages=[locale],
+        fallback=True,
+    )
+
+
+def preload_translations() -> list[str]:
+    """
+    Load the translation catalogs of every available locale.
+
+    Returns:
+        list[str]: The locales that were loaded.
+    """
+    locales = sorted(entry.name for entry in os.scandir(LOCALE_DIR) if entry.is_dir())
+
+    for locale in locales:
+        get_translation(locale)
+
+    return locales
+
+
+def warm_connection() -> int | None:
+    """
+    Open a pooled connection to the LMS.
+
+    Returns:
+        int | None: The status code returned by the LMS, or None if the
+        LMS domain is not configured.
+    """
+    if not LMS_DOMAIN:
+        return None
+
+    response = session.head(LMS_DOMAIN, timeout=REQUEST_MAX_TIMEOUT)
+
+    return response.status_code
@@ -0,0 +1,75 @@
+"""
+Warm-up support for the Alexa skill.
+
+A scheduled event (e.g. an EventBridge rule targeting the skill's Lambda) can
+be used to keep the container warm. Such events are not Alexa requests, so they
+are handled before the skill dispatcher and never reach the Alexa SDK.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Callable
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+SCHEDULED_EVENT_SOURCE = "aws.events"
+
+
+def is_warmup_event(event: Any) -> bool:
+    """
+    Check whether the event is a warm-up ping instead of an Alexa request.
+
+    An event is considered a warm-up ping if it is a scheduled event sent by
+    EventBridge, or if it explicitly contains `"warmup": true`.
+
+    Args:
+        event (Any): The event received by the Lambda handler.
+
+    Returns:
+        bool: True if the event is a warm-up ping, False otherwise.
+    """
+    if not isinstance(event, dict):
+        return False
+
+    return event.get("source") == SCHEDULED_EVENT_SOURCE or event.get("warmup") is True
+
+
+def run_warmup(steps: dict[str, Callable[[], Any]]) -> dict:
+    """
+    Run the warm-up steps and report how long each one took.
+
+    A failing step is logged and reported, but it does not prevent the
+    remaining steps from running.
+
+    Args:
+        steps (dict[str, Callable]): The warm-up steps, by name. The value
+        returned by each step is included in the report.
+
+    Returns:
+        dict: The warm-up report, with the result and duration (in milliseconds)
+        of each step and the total duration.
+    """
+    report: dict = {"warmup": True, "steps": []}
+    warmup_start = time.perf_counter()
+
+    for name, step in steps.items():
+        step_report: dict = {"name": name, "ok": True}
+        step_start = time.perf_counter()
+
+        try:
+            step_report["detail"] = step()
+        except Exception as error:  # pylint: disable=broad-except
+            logger.error("Warm-up step %s failed: %s", name, error)
+            step_report["ok"] = False
+            step_report["detail"] = str(error)
+
+        step_report["duration_ms"] = round((time.perf_counter() - step_start) * 1000, 2)
+        report["steps"].append(step_report)
+
+    report["duration_ms"] = round((time.perf_counter() - warmup_start) * 1000, 2)
+    logger.info("Warm-up report: %s", report)
+
+    return report
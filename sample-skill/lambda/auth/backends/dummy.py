@@ -1,4 +1,6 @@
 """Dummy Authentication Backend"""
+from ask_sdk_core.handler_input import HandlerInput
+
 from auth.backends.base import BaseEmailAuthenticationBackend
 
 
@@ -10,6 +12,9 @@ class DummyEmailAuthentication(BaseEmailAuthenticationBackend):
     purposes. It always returns the same email address.
     """
 
+    def __init__(self, handler_input: HandlerInput):
+        self.handler_input = handler_input
+
     def get_email(self) -> str:
         """
         Retrieve the static email address.
@@ -8,9 +8,9 @@ the student's progress in a given course on the Open edX platform.
 from __future__ import annotations
 
 from difflib import SequenceMatcher as matcher
-import gettext
 import logging
-from typing import Callable
+import time
+from typing import Any, Callable
 
 import ask_sdk_core.utils as ask_utils
 from ask_sdk_core.api_client import DefaultApiClient
@@ -24,18 +24,37 @@ from ask_sdk_core.skill_builder import CustomSkillBuilder
 from ask_sdk_model.response import Response
 
 from alexa import data
+from alexa.recorder import (
+    RecorderRequestInterceptor,
+    RecorderResponseInterceptor,
+    record_email,
+    record_token_cached,
+)
 from alexa.settings import (
     LMS_DOMAIN,
     EOX_CORE_CLIENT_ID,
     EOX_CORE_CLIENT_SECRET,
     EOX_CORE_GRANT_TYPE,
+    SKILL_RECORDER_FILE,
+)
+from alexa.utils import (
+    get_email_auth_class,
+    get_translation,
+    make_request,
+    preload_translations,
+    warm_connection,
 )
-from alexa.utils import make_request, get_email_auth_class
+from alexa.warmup import is_warmup_event, run_warmup
 
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Seconds before the real expiration at which a cached token is considered expired.
+TOKEN_EXPIRATION_MARGIN = 60
+
+_token_cache: dict = {"access_token": None, "expires_at": 0.0}
+
 
 class LaunchRequestHandler(AbstractRequestHandler):
     """
@@ -68,14 +87,27 @@ class LaunchRequestHandler(AbstractRequestHandler):
         )
 
 
-def get_bearer_token() -> str | None:
+def get_bearer_token(force_refresh: bool = False) -> str | None:
     """
     Retrieve the Bearer token required to consume the API.
 
+    The token is cached for the lifetime of the container until it is about
+    to expire, so warm invocations do not request a new one. If the LMS
+    rejects a cached token, it must be discarded with `invalidate_bearer_token`.
+
+    Args:
+        force_refresh (bool): Request a new token even if a cached one is valid.
+
     Returns:
         str | None: The Bearer token if successfully retrieved,
         None if the token can't be obtained.
     """
+    cached = not force_refresh and is_bearer_token_cached()
+    record_token_cached(cached)
+
+    if cached:
+        return _token_cache["access_token"]
+
     endpoint_url = f"{LMS_DOMAIN}/oauth2/access_token"
     payload = (
         f"client_id={EOX_CORE_CLIENT_ID}&"
@@ -85,8 +117,50 @@ def get_bearer_token() -> str | None:
     headers = {"Content-Type": "application/x-www-form-urlencoded"}
 
     response = make_request(endpoint_url, "POST", data=payload, headers=headers)
+    access_token = response.get("access_token")
+
+    if access_token and response.get("expires_in"):
+        _token_cache["access_token"] = access_token
+        _token_cache["expires_at"] = (
+            time.monotonic() + response["expires_in"] - TOKEN_EXPIRATION_MARGIN
+        )
+
+    return access_token
 
-    return response.get("access_token")
+
+def is_bearer_token_cached() -> bool:
+    """
+    Check whether a valid Bearer token is cached.
+
+    Returns:
+        bool: True if the next call to `get_bearer_token` uses the cached token.
+    """
+    return _token_cache["expires_at"] > time.monotonic()
+
+
+def invalidate_bearer_token() -> None:
+    """
+    Discard the cached Bearer token, e.g. when the LMS rejects it because it
+    was revoked, so the next call to `get_bearer_token` requests a new one.
+    """
+    _token_cache["access_token"] = None
+    _token_cache["expires_at"] = 0.0
+
+
+def warm_bearer_token() -> bool:
+    """
+    Refresh the cached Bearer token.
+
+    Returns:
+        bool: True, once a new token is obtained.
+
+    Raises:
+        RuntimeError: If the LMS does not return a token.
+    """
+    if get_bearer_token(force_refresh=True) is None:
+        raise RuntimeError("It was not possible to obtain a token from the LMS.")
+
+    return True
 
 
 def get_course_progress(username: str, course_id: str, token: str) -> float:
@@ -243,6 +317,7 @@ def get_email(email_auth_instance: Callable) -> tuple[str | None, str | None]:
     error_message = None
 
     email = email_auth_instance.get_email()
+    record_email(email)
 
     if not email:
         error_message = email_auth_instance.EMAIL_ERROR_MESSAGE
@@ -301,6 +376,7 @@ def get_speak_output_get_course_progress(
 
     coursename_input = slots["coursename"].value.lower()
 
+    token_was_cached = is_bearer_token_cached()
     token = get_bearer_token()
 
     if not token:
@@ -308,6 +384,17 @@ def get_speak_output_get_course_progress(
 
     username = get_username_by_email(email, token)
 
+    if not username and token_was_cached:
+        # The LMS answers a revoked token as a failed lookup, so retry once
+        # with a new token before reporting the user as not found.
+        invalidate_bearer_token()
+        token = get_bearer_token()
+
+        if not token:
+            return _(data.TOKEN_ERROR_MESSAGE)
+
+        username = get_username_by_email(email, token)
+
     if not username:
         return _(data.USER_NOT_FOUND_MESSAGE).format(email)
 
@@ -439,12 +526,7 @@ class LocalizationInterceptor(AbstractRequestInterceptor):
         locale = handler_input.request_envelope.request.locale
         logger.info("Locale is %s", locale)
 
-        i18n = gettext.translation(
-            "data",
-            localedir="locale",
-            languages=[locale],
-            fallback=True,
-        )
+        i18n = get_translation(locale)
         handler_input.attributes_manager.request_attributes["_"] = i18n.gettext
 
 
@@ -461,4 +543,35 @@ sb.add_exception_handler(CatchAllExceptionHandler())
 
 sb.add_global_request_interceptor(LocalizationInterceptor())
 
-lambda_handler = sb.lambda_handler()
+if SKILL_RECORDER_FILE:
+    sb.add_global_request_interceptor(RecorderRequestInterceptor())
+    sb.add_global_response_interceptor(RecorderResponseInterceptor(SKILL_RECORDER_FILE))
+
+skill_handler = sb.lambda_handler()
+
+
+def lambda_handler(event: Any, context: Any) -> Any:
+    """
+    Entry point of the Lambda function.
+
+    Warm-up pings are answered here with a report of what was warmed, without
+    going through the Alexa SDK. Any other event is dispatched to the skill.
+
+    Args:
+        event (Any): The event received by the Lambda function.
+        context (Any): The Lambda runtime context.
+
+    Returns:
+        Any: The warm-up report for warm-up pings, otherwise the serialized
+        response envelope of the skill.
+    """
+    if is_warmup_event(event):
+        return run_warmup(
+            {
+                "translations": preload_translations,
+                "connections": warm_connection,
+                "token": warm_bearer_token,
+            }
+        )
+
+    return skill_handler(event, context)